@@ -36,13 +36,22 @@ __copyright__ = "Copyright (C) 2024 John Bumgarner"
 # Python imports required for basic operations
 ##################################################################################
 # Standard library imports
-from time import sleep
 from typing import Union
-from random import randint
 # Third-party imports
 import requests
 # Local or project-specific imports
+from utilities.async_tasks import query_each, query_each_async
 from utilities.colorized_text import colorized_text
+from utilities.http_session import create_session, decode_json
+from utilities.rate_limiter import RateLimiter
+from utilities.response_cache import ResponseCache
+
+# Pooled HTTP session shared by all ArinWhois queries
+_SESSION = create_session()
+# ARIN does not publish a query limit, so a conservative one is applied
+_LIMITER = RateLimiter(max_calls=60, period=60)
+# Registration data changes rarely, so responses are reused for six hours
+_CACHE = ResponseCache(maxsize=4096, ttl=6 * 3600)
 
 
 class ArinWhois:
@@ -84,10 +93,20 @@ class ArinWhois:
                  lookup_value: str | list = ''):
         self.lookup_value = lookup_value
 
-    data: dict = {}
+    # number of worker threads querying the ARIN WHOIS database at the same time
+    _MAX_WORKERS: int = 10
 
     @classmethod
-    def _get_whois_json(cls, ip_address: str) -> Union[dict, None]:
+    def close(cls) -> None:
+        """
+        Closes the pooled HTTP session used to query the ARIN WHOIS database.
+
+        :return: None
+        """
+        _SESSION.close()
+
+    @staticmethod
+    def _get_whois_json(ip_address: str) -> Union[dict, None]:
         """
         Obtains the WHOIS information for the specific IP address being queried.
 
@@ -95,75 +114,76 @@ class ArinWhois:
         :return: dictionary of WHOIS data
         :rtype: dict
         """
-        sleep(randint(a=1, b=3))
+        cached_response = _CACHE.get(ip_address)
+        if cached_response is not None:
+            return cached_response
         try:
-            response = requests.get(url=f'https://whois.arin.net/rest/ip/{ip_address}.json', timeout=(5, 10))
+            with _LIMITER:
+                response = _SESSION.get(f'https://whois.arin.net/rest/ip/{ip_address}.json', timeout=(5, 10))
             if response.status_code == 200:
-                cls.data = response.json()
-                return cls.data
+                decoded_response = decode_json(response)
+                _CACHE.set(ip_address, decoded_response)
+                return decoded_response
         except requests.exceptions.Timeout:
             colorized_text(text=f"Request timed out for IP address {ip_address}", color='red')
         except requests.exceptions.RequestException as e:
             colorized_text(text=f"An error occurred: {e}", color='red')
         return None
 
-    @classmethod
-    def _get_registered_organization(cls) -> Union[str, None]:
-        """
-        Obtains the name of the registered organization associated with the
-        specific IP address being queried.
-
-        :return: registered organization name
-        :rtype: str
-        """
-        try:
-            if not cls.data['net']['orgRef']['@name']:
-                return "registered organization unavailable"
-            elif cls.data['net']['orgRef']['@name']:
-                return cls.data['net']['orgRef']['@name']
-        except KeyError:
-            colorized_text(text="Registered_organization is not present in JSON data", color='red')
-        return None
-
-    @classmethod
-    def _get_network_range(cls) -> Union[str, None]:
+    @staticmethod
+    def _extract_whois(ip_address: str, data: dict) -> dict:
         """
-        Obtains the IP address range associated with the specific IP address
-        being queried.
+        Extracts the registered organization, the network range and the Classless
+        Inter-Domain Routing (CIDR) range from the WHOIS data associated with the
+        specific IP address being queried.  The network range is the start and end
+        address of the network, and every CIDR range of its netblocks is listed.
 
-        :return: IP address range
-        :rtype: str
+        :param ip_address: IP address being queried
+        :param data: WHOIS data for the IP address being queried
+        :return: dict of data elements related to the IP address
+        :rtype: dict
         """
-        try:
-            if not cls.data['net']['netBlocks']['netBlock']['startAddress']['$']:
-                return "netblock range unavailable"
-            elif cls.data['net']['netBlocks']['netBlock']['startAddress']['$']:
-                starting_ip_address = cls.data['net']['netBlocks']['netBlock']['startAddress']['$']
-                ending_ip_address = cls.data['net']['netBlocks']['netBlock']['endAddress']['$']
-                return f'{starting_ip_address}-{ending_ip_address}'
-        except KeyError:
-            colorized_text(text='The JSON keys to obtain the network range were invalid.', color='red')
-        return None
+        net = data.get('net') or {}
+        organization = (net.get('orgRef') or {}).get('@name') or 'registered organization unavailable'
+
+        # ARIN returns a single netBlock as a dict and multiple netBlocks as a list
+        net_blocks = (net.get('netBlocks') or {}).get('netBlock') or []
+        if isinstance(net_blocks, dict):
+            net_blocks = [net_blocks]
+
+        starting_ip_address = (net.get('startAddress') or {}).get('$')
+        ending_ip_address = (net.get('endAddress') or {}).get('$')
+        if starting_ip_address and ending_ip_address:
+            network_range = f'{starting_ip_address}-{ending_ip_address}'
+        else:
+            network_range = 'netblock range unavailable'
+
+        cidr_ranges = [f"{net_block['startAddress']['$']}/{(net_block.get('cidrLength') or {}).get('$')}"
+                       for net_block in net_blocks if (net_block.get('startAddress') or {}).get('$')]
+        cidr_range = ', '.join(cidr_ranges) if cidr_ranges else 'CIDR range unavailable'
+
+        return {'ip_address': ip_address,
+                'organization': organization,
+                'network': network_range,
+                'cidr': cidr_range}
 
     @classmethod
-    def _get_cidr_range(cls) -> Union[str, None]:
+    def _fetch_one(cls, ip_address: str) -> dict:
         """
-        Obtains the Classless Inter-Domain Routing (CIDR) range associated with the
-        specific IP address being queried.
+        Queries the ARIN WHOIS database for a single IP address and extracts
+        the data elements related to it.
 
-        :return: CIDR range
-        :rtype: str
+        :param ip_address: IP address being queried
+        :return: dict of data elements related to the IP address
+        :rtype: dict
         """
-        try:
-            if not cls.data['net']['netBlocks']['netBlock']['startAddress']['$']:
-                return "CIDR range unavailable"
-            elif cls.data['net']['netBlocks']['netBlock']['startAddress']['$']:
-                starting_ip_address = cls.data['net']['netBlocks']['netBlock']['startAddress']['$']
-                cidr_subnet_range = cls.data['net']['netBlocks']['netBlock']['cidrLength']['$']
-                return f'{starting_ip_address}/{cidr_subnet_range}'
-        except KeyError:
-            colorized_text(text='The JSON keys to obtain the CIDR range were invalid.', color='red')
-        return None
+        data = cls._get_whois_json(ip_address)
+        if not data:
+            return {'ip_address': ip_address,
+                    'organization': None,
+                    'network': None,
+                    'cidr': None}
+        return cls._extract_whois(ip_address, data)
 
     def query_whois(self) -> Union[dict | list[dict] | None]:
         """
@@ -174,27 +194,14 @@ class ArinWhois:
         :return: dict of data elements related to the input data
         :rtype: dict or list
         """
-        if isinstance(self.lookup_value, str):
-            ArinWhois._get_whois_json(self.lookup_value)
-            registered_organization = ArinWhois._get_registered_organization()
-            network_range = ArinWhois._get_network_range()
-            cidr_range = ArinWhois._get_cidr_range()
-            data_elements = {'ip_address': self.lookup_value,
-                             'organization': registered_organization,
-                             'network': network_range,
-                             'cidr': cidr_range}
-            return data_elements
-        elif isinstance(self.lookup_value, list):
-            data_elements = []
-            for item in self.lookup_value:
-                ArinWhois._get_whois_json(item)
-                registered_organization = ArinWhois._get_registered_organization()
-                network_range = ArinWhois._get_network_range()
-                cidr_range = ArinWhois._get_cidr_range()
-                data = {'ip_address': item,
-                        'organization': registered_organization,
-                        'network': network_range,
-                        'cidr': cidr_range}
-                data_elements.append(data)
-            return data_elements
-        return None
+        return query_each(ArinWhois._fetch_one, self.lookup_value, ArinWhois._MAX_WORKERS)
+
+    async def query_whois_async(self) -> Union[dict | list[dict] | None]:
+        """
+        Asynchronous version of query_whois, which allows the queries against
+        the ARIN WHOIS database to be awaited alongside other coroutines.
+
+        :return: dict of data elements related to the input data
+        :rtype: dict or list
+        """
+        return await query_each_async(ArinWhois._fetch_one, self.lookup_value, ArinWhois._MAX_WORKERS)
@@ -9,6 +9,7 @@ Available commands:
 - 'abuse': Perform an AbuseIPDB database lookup for the given IP address using an API key.
 - 'geo': Perform an IP Geolocation lookup for the given IP address.
 - 'mac': Perform a MAC address lookup for the given MAC address.
+- 'all': Perform the ARIN WHOIS, IP Geolocation and AbuseIPDB lookups concurrently for the given IP address.
 
 """
 __author__ = 'John Bumgarner'
@@ -40,26 +41,36 @@ __copyright__ = "Copyright (C) 2024 John Bumgarner"
 ##################################################################################
 # Standard library imports
 import sys
+import asyncio
 import argparse
 # Local or project-specific imports
-from arin_whois_lookup import ArinWhois
-from ip_reputation_lookup import IPReputation
-from ip_geolocation_lookup import IPGeoLocation
-from mac_address_vendor_lookup import MacAddressLookup
+# The lookup modules are imported inside the run_* functions, so that
+# each command only loads the module it uses.
+from utilities.dns_cache import cached_dns
+from utilities.colorized_text import colorized_text
 
+# Hostnames of the remote APIs queried by the lookup modules
+API_HOSTNAMES = ('whois.arin.net', 'ip-api.com', 'api.abuseipdb.com', 'api.maclookup.app',
+                 'www.wireshark.org')
 
-def run_arin_whois(ip_address: str) -> None:
+
+def run_arin_whois(ip_address: list[str]) -> None:
     """
-    Run the ARIN WHOIS lookup for a given IP address.
+    Run the ARIN WHOIS lookup for a given list of IP addresses.
 
     This function creates an instance of the ArinWhois class and queries the WHOIS
-    database for information related to the specified IP address. The result is then printed.
+    database for information related to the specified IP addresses. The result is then printed.
 
-    :param ip_address: The IP address to lookup in the ARIN WHOIS database.
-    :param type ip_address: str
+    :param ip_address: The IP addresses to lookup in the ARIN WHOIS database.
+    :param type ip_address: list[str]
     """
+    from arin_whois_lookup import ArinWhois
+
     whois = ArinWhois(ip_address)
-    result = whois.query_whois()
+    try:
+        result = asyncio.run(whois.query_whois_async())
+    finally:
+        ArinWhois.close()
     print(result)
 
 
@@ -75,8 +86,13 @@ def run_ip_reputation(ip_address: str, api_key: str) -> None:
     :param api_key: The API key for accessing the IP reputation database.
     :param type api_key: str
     """
+    from ip_reputation_lookup import IPReputation
+
     reputation = IPReputation(ip_address, api_key)
-    result = reputation.query_abuse_database()
+    try:
+        result = reputation.query_abuse_database()
+    finally:
+        IPReputation.close()
     print(result)
 
 
@@ -90,25 +106,83 @@ def run_ip_geolocation(ip_address: str) -> None:
     :param ip_address: The IP address to lookup in the geolocation database.
     :param type ip_address: str
     """
+    from ip_geolocation_lookup import IPGeoLocation
+
     geo = IPGeoLocation(ip_address)
-    result = geo.query_geolocation_database()
+    try:
+        result = geo.query_geolocation_database()
+    finally:
+        IPGeoLocation.close()
     print(result)
 
 
-def run_mac_address_lookup(mac_address: str) -> None:
+def run_mac_address_lookup(mac_address: str, manuf: str | None = None) -> None:
     """
     Run the MAC address lookup for a given MAC address.
 
     This function creates an instance of the MacAddressLookup class and queries the database
     for information related to the specified MAC address. The result is then printed.
+    When a Wireshark manuf file is provided, it is searched before the database is queried.
+    Errors returned by the database are printed and the program exits with status 1.
 
     :param mac_address: The MAC address to lookup in the MAC address database.
     :param type mac_address: str
+    :param manuf: The Wireshark manuf file used for offline lookups.
+    :param type manuf: str
     """
+    from mac_address_vendor_lookup import MacAddressLookup, MacLookupError
+
     mac = MacAddressLookup(mac_address)
-    result = mac.lookup_address_information()
+    try:
+        if manuf:
+            MacAddressLookup.load_local_db(manuf)
+            result = mac.lookup_address_information_local()
+        else:
+            result = mac.lookup_address_information()
+    except MacLookupError as error:
+        colorized_text(text=str(error), color='red')
+        sys.exit(1)
+    finally:
+        MacAddressLookup.close()
     print(result)
 
+
+async def run_all_lookups(ip_address: str, api_key: str | None = None) -> None:
+    """
+    Run the ARIN WHOIS, IP geolocation and IP reputation lookups concurrently for a given IP address.
+
+    This function awaits the asynchronous query of each lookup class at the same time, so the
+    total time is that of the slowest lookup. Each result is printed as soon as it completes.
+    The IP reputation lookup is skipped when no API key is provided.
+
+    :param ip_address: The IP address to lookup.
+    :param type ip_address: str
+    :param api_key: The API key for accessing the IP reputation database.
+    :param type api_key: str
+    """
+    from arin_whois_lookup import ArinWhois
+    from ip_geolocation_lookup import IPGeoLocation
+
+    async def labelled(label: str, query) -> tuple:
+        return label, await query
+
+    lookups = [labelled('arin', ArinWhois(ip_address).query_whois_async()),
+               labelled('geo', IPGeoLocation(ip_address).query_geolocation_database_async())]
+    if api_key:
+        from ip_reputation_lookup import IPReputation
+        lookups.append(labelled('abuse', IPReputation(ip_address, api_key).query_abuse_database_async()))
+
+    try:
+        for lookup in asyncio.as_completed(lookups):
+            label, result = await lookup
+            print(f'{label}: {result}')
+    finally:
+        ArinWhois.close()
+        IPGeoLocation.close()
+        if api_key:
+            IPReputation.close()
+
+
 def main():
     """
     Main function for the Network Forensics Tools CLI.
@@ -121,6 +195,7 @@ def main():
         - 'abuse': Perform an AbuseIPDB database lookup for the given IP address(es) using an API key.
         - 'geo': Perform an IP Geolocation lookup for the given IP address(es).
         - 'mac': Perform a MAC address lookup for the given MAC address(es).
+        - 'all': Perform the ARIN WHOIS, IP Geolocation and AbuseIPDB lookups concurrently for the given IP address.
 
     Each subcommand has its own set of arguments:
         - ARIN WHOIS lookup:
@@ -132,6 +207,10 @@ def main():
           - ip_address: IP address to lookup.
         - MAC address lookup:
           - mac_address: MAC address to lookup.
+          - --manuf: optional Wireshark manuf file that is searched before the MAC address database.
+        - Combined IP address lookup:
+          - ip_address: IP address to lookup.
+          - --abuse-key: optional API key for AbuseIPDB; the AbuseIPDB lookup is skipped without it.
 
     The function then executes the appropriate function based on the provided command and arguments.
     """
@@ -154,21 +233,31 @@ def main():
     # MAC (Media Access Control) address lookup
     mac_parser = subparsers.add_parser(name='mac', help='MAC address lookup')
     mac_parser.add_argument('mac_address', type=str, help='MAC address to lookup')
+    mac_parser.add_argument('--manuf', type=str, required=False,
+                            help='Wireshark manuf file used for offline lookups, downloaded when missing')
+
+    # Combined ARIN WHOIS, IP Geolocation and AbuseIPDB lookup
+    all_parser = subparsers.add_parser(name='all', help='ARIN WHOIS, IP Geolocation and AbuseIPDB lookups')
+    all_parser.add_argument('ip_address', type=str, help='IP address to lookup')
+    all_parser.add_argument('--abuse-key', type=str, required=False, help='API key for AbuseIPDB')
 
     args = parser.parse_args()
 
-    if args.command == 'arin':
-        run_arin_whois(args.ip_address)
-    elif args.command == 'abuse':
-        run_ip_reputation(args.ip_address, args.api_key)
-        print(args.api_key)
-    elif args.command == 'geo':
-        run_ip_geolocation(args.ip_address)
-    elif args.command == 'mac':
-        run_mac_address_lookup(args.mac_address)
-    else:
-        parser.print_help()
-        sys.exit(1)
+    with cached_dns(API_HOSTNAMES):
+        if args.command == 'arin':
+            run_arin_whois(args.ip_address)
+        elif args.command == 'abuse':
+            run_ip_reputation(args.ip_address, args.api_key)
+            print(args.api_key)
+        elif args.command == 'geo':
+            run_ip_geolocation(args.ip_address)
+        elif args.command == 'mac':
+            run_mac_address_lookup(args.mac_address, args.manuf)
+        elif args.command == 'all':
+            asyncio.run(run_all_lookups(args.ip_address, args.abuse_key))
+        else:
+            parser.print_help()
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -34,15 +34,28 @@ __copyright__ = "Copyright (C) 2024 John Bumgarner"
 # Python imports required for basic operations
 ##################################################################################
 # Standard library imports
-import sys
-import json
-from time import sleep
+import operator
 from typing import Union
-from random import randint
 # Third-party imports
 import requests
 # Local or project-specific imports
+from utilities.async_tasks import query_each, query_each_async
 from utilities.colorized_text import colorized_text
+from utilities.http_session import create_session, decode_json, retry_after_seconds
+from utilities.rate_limiter import RateLimiter
+from utilities.response_cache import ResponseCache
+
+# Pooled HTTP session shared by all IPGeoLocation queries
+_SESSION = create_session()
+# ip-api.com allows 45 requests per minute from a single IP address
+_LIMITER = RateLimiter(max_calls=45, period=60)
+# longest time the limiter is paused for after a 429 response
+_MAX_PAUSE = 60
+# Geolocation data changes rarely, so responses are reused for six hours
+_CACHE = ResponseCache(maxsize=4096, ttl=6 * 3600)
+# Fields extracted from each geolocation response, in a single C-level call
+_GEO_EXTRACT = operator.itemgetter("query", "org", "isp", "countryCode", "regionName",
+                                   "city", "lat", "lon", "timezone", "as")
 
 
 class IPGeoLocation:
@@ -84,6 +97,18 @@ class IPGeoLocation:
                  lookup_value: str | list = ''):
         self.lookup_value = lookup_value
 
+    # kept low, because ip-api.com allows 45 queries per minute
+    _MAX_WORKERS: int = 4
+
+    @classmethod
+    def close(cls) -> None:
+        """
+        Closes the pooled HTTP session used to query the IP Geolocation database.
+
+        :return: None
+        """
+        _SESSION.close()
+
     @staticmethod
     def _get_json_data(ip_address: str) -> Union[dict | None]:
         """
@@ -93,24 +118,43 @@ class IPGeoLocation:
         :return: dictionary of reputation data
         :rtype: dictionary
         """
-        sleep(randint(a=1, b=3))
-
+        cached_response = _CACHE.get(ip_address)
+        if cached_response is not None:
+            return cached_response
         try:
-            response = requests.request(method='GET', url=f'http://ip-api.com/json/{ip_address}', timeout=(5, 10))
-            decoded_response = json.loads(response.text)
-            if response.status_code == 200:
-                query_status = decoded_response["status"]
-                if query_status == 'fail':
-                    colorized_text(text=f'The query failed. Please review your input data for {ip_address}',
-                                   color='red')
-                elif query_status == 'success':
-                    return decoded_response
+            with _LIMITER:
+                response = _SESSION.get(f'http://ip-api.com/json/{ip_address}', timeout=(5, 10))
+            if response.status_code == 429:
+                # ip-api.com reports the seconds until the rate limit resets in X-Ttl
+                retry_after = retry_after_seconds(response)
+                if retry_after is None:
+                    try:
+                        retry_after = float(response.headers.get('X-Ttl', _MAX_PAUSE))
+                    except ValueError:
+                        retry_after = _MAX_PAUSE
+                _LIMITER.pause(min(retry_after, _MAX_PAUSE))
+                colorized_text(text=f'The rate limit was exceeded while querying {ip_address}', color='red')
+                return None
+            elif response.status_code != 200:
+                colorized_text(text=f'The query for {ip_address} failed with status code {response.status_code}',
+                               color='red')
+                return None
+
+            decoded_response = decode_json(response)
+            query_status = decoded_response["status"]
+            if query_status == 'fail':
+                colorized_text(text=f'The query failed. Please review your input data for {ip_address}',
+                               color='red')
+            elif query_status == 'success':
+                _CACHE.set(ip_address, decoded_response)
+                return decoded_response
         except requests.ConnectionError:
-            colorized_text(text='A ConnectionError has occurred.', color='red')
-            sys.exit(1)
+            colorized_text(text=f'A ConnectionError has occurred for IP address {ip_address}', color='red')
         except requests.Timeout:
-            colorized_text(text='A connection timeout has occurred.', color='red')
-            sys.exit(1)
+            colorized_text(text=f'A connection timeout has occurred for IP address {ip_address}', color='red')
+        except requests.RequestException as error:
+            # includes the JSONDecodeError raised for a body that is not JSON, such as a proxy error page
+            colorized_text(text=f'An error occurred for IP address {ip_address}: {error}', color='red')
         return None
 
     @classmethod
@@ -122,31 +166,38 @@ class IPGeoLocation:
         :return: dictionary of parsed information
         :rtype: dict
         """
-        ip_address = json.dumps(json_data["query"])
-        organization_name = json.dumps(json_data["org"])
-        isp_name = json.dumps(json_data["isp"])
-        country_code = json.dumps(json_data["countryCode"])
-        region_name = json.dumps(json_data["regionName"])
-        city_name = json.dumps(json_data["city"])
-        longitude = json.dumps(json_data["lat"])
-        latitude = json.dumps(json_data["lon"])
-        timezone = json.dumps(json_data["timezone"])
-        as_number = json.dumps(json_data["as"]).split(sep=" ", maxsplit=1)[0]
+        (ip_address, organization_name, isp_name, country_code, region_name,
+         city_name, latitude, longitude, timezone, as_name) = _GEO_EXTRACT(json_data)
 
         extracted_data = {
-            "ip_address": ip_address.strip('"'),
-            "domain_name": organization_name.strip('"'),
-            "as_number": as_number.strip('"'),
-            "isp_name": isp_name.strip('"'),
-            "country_code": country_code.strip('"'),
+            "ip_address": ip_address,
+            "domain_name": organization_name,
+            "as_number": str(as_name).split(sep=" ", maxsplit=1)[0],
+            "isp_name": isp_name,
+            "country_code": country_code,
             "region_name": region_name,
-            "city_name": city_name.strip('"'),
-            "longitude": longitude.strip('"'),
-            "latitude": latitude.strip('"'),
-            "timezone": timezone.strip('"')
+            "city_name": city_name,
+            "longitude": longitude,
+            "latitude": latitude,
+            "timezone": timezone
         }
         return extracted_data
 
+    @classmethod
+    def _fetch_one(cls, ip_address: str) -> Union[dict | None]:
+        """
+        Queries the IP Geolocation database for a single IP address and
+        extracts the data elements related to it.
+
+        :param ip_address: IP address being queried
+        :return: dict of data elements related to the IP address
+        :rtype: dict
+        """
+        data = cls._get_json_data(ip_address)
+        if data:
+            return cls._decoded_json(data)
+        return None
+
     def query_geolocation_database(self) -> Union[dict | list[dict] | None]:
         """
         Processes the input data, which could be a single IP address
@@ -156,15 +207,15 @@ class IPGeoLocation:
         :return: dict of data elements related to the input data
         :rtype: dict or list
         """
-        if isinstance(self.lookup_value, str):
-            data = IPGeoLocation._get_json_data(self.lookup_value)
-            if data:
-                return IPGeoLocation._decoded_json(data)
-        elif isinstance(self.lookup_value, list):
-            data_elements = []
-            for item in self.lookup_value:
-                data = IPGeoLocation._get_json_data(item)
-                if data:
-                    data_elements.append(IPGeoLocation._decoded_json(data))
-            return data_elements
-        return None
+        return query_each(IPGeoLocation._fetch_one, self.lookup_value, IPGeoLocation._MAX_WORKERS)
+
+    async def query_geolocation_database_async(self) -> Union[dict | list[dict] | None]:
+        """
+        Asynchronous version of query_geolocation_database, which allows the queries
+        against the IP Geolocation database located at https://ip-api.com to be
+        awaited alongside other coroutines.
+
+        :return: dict of data elements related to the input data
+        :rtype: dict or list
+        """
+        return await query_each_async(IPGeoLocation._fetch_one, self.lookup_value, IPGeoLocation._MAX_WORKERS)
@@ -33,15 +33,46 @@ __copyright__ = "Copyright (C) 2024 John Bumgarner"
 # Python imports required for basic operations
 ##################################################################################
 # Standard library imports
-import sys
-import json
-from time import sleep
+import operator
+import threading
+from bisect import bisect_right
 from typing import Union
-from random import randint
 # Third-party imports
 import requests
 # Local or project-specific imports
+from utilities.async_tasks import query_each, query_each_async
 from utilities.colorized_text import colorized_text
+from utilities.http_session import create_session, decode_json, retry_after_seconds
+from utilities.rate_limiter import RateLimiter
+from utilities.response_cache import ResponseCache
+
+# AbuseIPDB check endpoint and the headers sent with every request
+_ABUSE_URL = 'https://api.abuseipdb.com/api/v2/check'
+_ABUSE_BASE_HEADERS = {'Accept': 'application/json'}
+# The max age in days must be between 1 and 365
+_MAX_AGE_IN_DAYS = '90'
+# Pooled HTTP session shared by all IPReputation queries
+_SESSION = create_session()
+# AbuseIPDB quotas are per day, so requests are spread across each minute
+_LIMITER = RateLimiter(max_calls=60, period=60)
+# AbuseIPDB has no multi-address check endpoint, so the number of requests
+# in flight is bounded across every IPReputation instance instead
+_IN_FLIGHT = threading.BoundedSemaphore(value=4)
+# longest time the limiter is paused for after a 429 response
+_MAX_PAUSE = 60
+# Abuse reports are updated continually, so responses are only reused for an hour
+_CACHE = ResponseCache(maxsize=4096, ttl=3600)
+# Confidence scores at which each abuse level starts, and the matching labels:
+# 0 is not malicious, 1-25 likely not malicious, 26-99 likely malicious, 100 malicious
+_ABUSE_LEVEL_CUTOFFS = (1, 26, 100)
+_ABUSE_LEVELS = ("not malicious",
+                 "likely not malicious but warrants further investigation",
+                 "likely malicious and warrants further investigation",
+                 "is malicious and warrants additional investigation")
+# Fields extracted from each report entry, in a single C-level call
+_REPORT_EXTRACT = operator.itemgetter("ipAddress", "domain", "hostnames", "usageType", "isp", "countryCode",
+                                      "abuseConfidenceScore", "isWhitelisted", "isTor", "totalReports",
+                                      "lastReportedAt")
 
 
 class IPReputation:
@@ -84,56 +115,70 @@ class IPReputation:
                  api_key: str = ''):
         self.lookup_value = lookup_value
         self.api_key = api_key
+        # API Key
+        # https://www.abuseipdb.com/pricing
+        self._headers = {**_ABUSE_BASE_HEADERS, 'Key': api_key}
+
+    # matches the _IN_FLIGHT limit on concurrent AbuseIPDB requests
+    _MAX_WORKERS: int = 4
+
+    @classmethod
+    def close(cls) -> None:
+        """
+        Closes the pooled HTTP session used to query the AbuseIPDB database.
+
+        :return: None
+        """
+        _SESSION.close()
 
     @staticmethod
-    def _get_json_data(ip_address: str, api_key: str) -> Union[dict, None]:
+    def _get_json_data(ip_address: str, headers: dict) -> Union[dict, None]:
         """
         Obtains the reputation information for the IP address being queried.
 
         :param ip_address: IP address being queried
+        :param headers: request headers containing the AbuseIPDB API key
         :return: dictionary of reputation data
         :rtype: dictionary
         """
-        sleep(randint(a=1, b=3))
+        cache_key = (ip_address, headers['Key'])
+        cached_response = _CACHE.get(cache_key)
+        if cached_response is not None:
+            return cached_response
 
-        url = 'https://api.abuseipdb.com/api/v2/check'
-
-        querystring = {
-            'ipAddress': ip_address,
-            # The max age in days must be between 1 and 365
-            'maxAgeInDays': '90'
-        }
-
-        headers = {
-            'Accept': 'application/json',
-            # API Key
-            # https://www.abuseipdb.com/pricing
-            'Key': api_key
-        }
         try:
-            response = requests.request(method='GET', url=url, headers=headers, params=querystring, timeout=(5, 10))
-            decoded_response = json.loads(response.text)
-            if response.status_code == 401:
-                error_message = json.dumps(decoded_response["errors"][0]['detail']).strip('"')
-                colorized_text(text=error_message, color='red')
-            elif response.status_code == 422:
-                error_message = json.dumps(decoded_response["errors"][0]['detail']).strip('"')
-                colorized_text(text=error_message, color='red')
-            elif response.status_code == 429:
-                error_message = json.dumps(decoded_response["errors"][0]['detail']).strip('"')
-                colorized_text(text=error_message, color='red')
-            elif response.status_code == 200:
+            with _IN_FLIGHT, _LIMITER:
+                response = _SESSION.get(_ABUSE_URL, headers=headers, timeout=(5, 10),
+                                        params={'ipAddress': ip_address, 'maxAgeInDays': _MAX_AGE_IN_DAYS})
+            if response.status_code == 200:
+                decoded_response = decode_json(response)
+                _CACHE.set(cache_key, decoded_response)
                 return decoded_response
+
+            if response.status_code == 429:
+                # the daily quota reports a reset hours away, which is not worth waiting for
+                retry_after = retry_after_seconds(response)
+                if retry_after is not None and retry_after <= _MAX_PAUSE:
+                    _LIMITER.pause(retry_after)
+            error_message = f'The query for {ip_address} failed with status code {response.status_code}'
+            if response.status_code in (401, 422, 429):
+                # the error body is not guaranteed to be JSON, such as when a proxy rejects the request
+                try:
+                    error_message = decode_json(response)["errors"][0]['detail']
+                except (ValueError, KeyError, IndexError, TypeError):
+                    pass
+            colorized_text(text=error_message, color='red')
         except requests.ConnectionError:
-            colorized_text(text='A ConnectionError has occurred.', color='red')
-            sys.exit(1)
+            colorized_text(text=f'A ConnectionError has occurred for IP address {ip_address}', color='red')
         except requests.Timeout:
-            colorized_text(text='A connection timeout has occurred.', color='red')
-            sys.exit(1)
+            colorized_text(text=f'A connection timeout has occurred for IP address {ip_address}', color='red')
+        except requests.RequestException as error:
+            # includes the JSONDecodeError raised for a body that is not JSON, such as a proxy error page
+            colorized_text(text=f'An error occurred for IP address {ip_address}: {error}', color='red')
         return None
 
     @staticmethod
-    def _determine_abuse_level(confidence_score: int) -> Union[str | None]:
+    def _determine_abuse_level(confidence_score: int) -> str:
         """
         Checks the reputation confidence score for a specific IP address
         and returns information related to it being either malicious or
@@ -143,54 +188,54 @@ class IPReputation:
         :return: string
         :rtype: str
         """
-        if confidence_score == 0:
-            return "not malicious"
-        elif confidence_score == 100:
-            return "is malicious and warrants additional investigation"
-        elif 100 > confidence_score > 25:
-            return "likley malicious and warrants further investigation"
-        elif 0 < confidence_score <= 25:
-            return "likley not malicious but warrants further investigation"
-        return None
+        return _ABUSE_LEVELS[bisect_right(_ABUSE_LEVEL_CUTOFFS, confidence_score)]
 
     @classmethod
-    def _decoded_json(cls, json_data: dict) -> dict:
+    def _decode_one(cls, report: dict) -> dict:
         """
-        Extracts specific information related to an IP address that was
-        queried in the AbuseIPDB database.
+        Extracts specific information related to an IP address from a
+        single report entry returned by the AbuseIPDB database.
 
+        :param report: report entry for the IP address being queried
         :return: dictionary of parsed information
         :rtype: dict
         """
-        ip_address = json.dumps(json_data["data"]["ipAddress"])
-        domain_name = json.dumps(json_data["data"]["domain"])
-        host_name = json.dumps(json_data["data"]["hostnames"])
-        usage_type = json.dumps(json_data["data"]["usageType"])
-        isp_name = json.dumps(json_data["data"]["isp"])
-        country_code = json.dumps(json_data["data"]["countryCode"])
-        confidence_of_abuse = json.dumps(json_data["data"]["abuseConfidenceScore"])
-        level_of_abuse = IPReputation._determine_abuse_level(int(confidence_of_abuse))
-        white_listed = json.dumps(json_data["data"]["isWhitelisted"])
-        tor_node = json.dumps(json_data["data"]["isTor"])
-        times_reported = json.dumps(json_data["data"]["totalReports"])
-        date_last_reported = json.dumps(json_data["data"]["lastReportedAt"])
+        (ip_address, domain_name, host_name, usage_type, isp_name, country_code, confidence_score,
+         white_listed, tor_node, times_reported, date_last_reported) = _REPORT_EXTRACT(report)
+        confidence_of_abuse = int(confidence_score)
 
         extracted_data = {
-            "ip_address": ip_address.strip('"'),
-            "domain_name": domain_name.strip('"'),
+            "ip_address": ip_address,
+            "domain_name": domain_name,
             "host_name": host_name,
-            "usage_type": usage_type.strip('"'),
-            "isp_name": isp_name.strip('"'),
-            "country_code": country_code.strip('"'),
-            "confidence_of_abuse": confidence_of_abuse.strip('"'),
-            "level_of_abuse": level_of_abuse,
-            "white_listed": white_listed.strip('"'),
-            "tor_node": tor_node.strip('"'),
-            "number_of_times_reported": times_reported.strip('"'),
-            "date_last_reported": date_last_reported.strip('"')
+            "usage_type": usage_type,
+            "isp_name": isp_name,
+            "country_code": country_code,
+            "confidence_of_abuse": confidence_of_abuse,
+            "level_of_abuse": IPReputation._determine_abuse_level(confidence_of_abuse),
+            "white_listed": white_listed,
+            "tor_node": tor_node,
+            "number_of_times_reported": times_reported,
+            "date_last_reported": date_last_reported
         }
         return extracted_data
 
+    @classmethod
+    def _fetch_one(cls, ip_address: str, headers: dict) -> Union[dict | None]:
+        """
+        Queries the AbuseIPDB database for a single IP address and
+        extracts the data elements related to it.
+
+        :param ip_address: IP address being queried
+        :param headers: request headers containing the AbuseIPDB API key
+        :return: dict of data elements related to the IP address
+        :rtype: dict
+        """
+        data = cls._get_json_data(ip_address, headers)
+        if data:
+            return cls._decode_one(data["data"])
+        return None
+
     def query_abuse_database(self) -> Union[dict | list[dict] | None]:
         """
         Processes the input data, which could be a single IP address
@@ -200,15 +245,15 @@ class IPReputation:
         :return: dict of data elements related to the input data
         :rtype: dict or list
         """
-        if isinstance(self.lookup_value, str):
-            data = IPReputation._get_json_data(self.lookup_value, self.api_key)
-            if data:
-                return IPReputation._decoded_json(data)
-        elif isinstance(self.lookup_value, list):
-            data_elements = []
-            for item in self.lookup_value:
-                data = IPReputation._get_json_data(item, self.api_key)
-                if data:
-                    data_elements.append(IPReputation._decoded_json(data))
-            return data_elements
-        return None
+        return query_each(IPReputation._fetch_one, self.lookup_value, IPReputation._MAX_WORKERS, self._headers)
+
+    async def query_abuse_database_async(self) -> Union[dict | list[dict] | None]:
+        """
+        Asynchronous version of query_abuse_database, which allows the queries against
+        the AbuseIPDB database to be awaited alongside other coroutines.
+
+        :return: dict of data elements related to the input data
+        :rtype: dict or list
+        """
+        return await query_each_async(IPReputation._fetch_one, self.lookup_value,
+                                      IPReputation._MAX_WORKERS, self._headers)
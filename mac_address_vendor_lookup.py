@@ -32,14 +32,83 @@ __copyright__ = "Copyright (C) 2024 John Bumgarner"
 # Python imports required for basic operations
 ##################################################################################
 # Standard library imports
-import sys
-from time import sleep
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from time import time
 from typing import Union
-from random import randint
+from random import uniform
 # Third-party imports
 import requests
 # Local or project-specific imports
+from utilities.async_tasks import gather_in_threads, map_in_threads
 from utilities.colorized_text import colorized_text
+from utilities.http_session import create_session, decode_json, retry_after_seconds
+from utilities.rate_limiter import RateLimiter
+from utilities.response_cache import ResponseCache
+
+# MAC addresses written as six pairs of hexadecimal digits, optionally separated by
+# colons or hyphens, or as three dot separated groups of four hexadecimal digits
+_MAC_RE = re.compile(r'^(?:[0-9A-Fa-f]{2}(?:[:-]?[0-9A-Fa-f]{2}){5}|[0-9A-Fa-f]{4}(?:\.[0-9A-Fa-f]{4}){2})$')
+
+# Pooled HTTP session shared by all MacAddressLookup queries
+_SESSION = create_session(retries=5, backoff_factor=0.5, status_forcelist=(502, 503, 504), respect_retry_after=True)
+_SESSION.headers.update({'User-Agent': 'mac-lookup/1.0', 'Accept': 'application/json'})
+# maclookup.app allows 2 requests per second on the free tier
+_LIMITER = RateLimiter(max_calls=2, period=1)
+# fraction of the rate limit quota left at which queries are paused until it resets
+_QUOTA_THRESHOLD = 0.1
+# Vendor records keyed by the assigned block prefix (MA-L, MA-M or MA-S) they cover
+_PREFIX_CACHE = ResponseCache(maxsize=4096, ttl=24 * 3600)
+# Lengths in hexadecimal digits of the MA-S, MA-M and MA-L block prefixes, longest first
+_PREFIX_LENGTHS = (9, 7, 6)
+# Registrant of the MA-L blocks that the IEEE splits into MA-M and MA-S assignments
+# (such as 70B3D5), whose record does not apply to the MAC addresses in those assignments
+_REGISTRATION_AUTHORITY = 'IEEE Registration Authority'
+# On-disk vendor records, which persist between program runs
+_DATABASE_PATH = Path.home() / '.cache' / 'mac_vendor.sqlite'
+_DATABASE_TTL = 30 * 86400
+_DATABASE_LOCK = threading.Lock()
+_database = None
+# set when the database cannot be opened, so the lookups fall back to the API without retrying
+_database_failed = False
+# Wireshark manuf file used for offline lookups, which is refreshed once a week
+_MANUF_URL = 'https://www.wireshark.org/download/automated/data/manuf'
+_MANUF_PATH = Path.home() / '.cache' / 'manuf'
+_MANUF_MAX_AGE = 7 * 86400
+# exponential backoff with full jitter applied when the API returns a 429 response
+_BACKOFF_BASE = 1
+_BACKOFF_CAP = 30
+_MAX_RETRIES = 5
+# longest Retry-After that is waited for before the query is abandoned
+_MAX_PAUSE = 60
+
+
+class MacLookupError(Exception):
+    """
+    Raised when the maclookup API returns an error response.
+    """
+
+
+class MacLookupUnauthorized(MacLookupError):
+    """
+    Raised when the maclookup API rejects the request as unauthorized.
+    """
+
+
+class MacLookupRateLimited(MacLookupError):
+    """
+    Raised when the maclookup API rate limit is still exceeded after the retries.
+
+    :param retry_after: number of seconds the server asked the client to wait, when provided
+    """
+
+    def __init__(self, message: str, retry_after: Union[float, None] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class MacAddressLookup:
@@ -71,79 +140,526 @@ class MacAddressLookup:
                  lookup_value: str | list = ''):
         self.lookup_value = lookup_value
 
-    data: dict = {}
+    # number of concurrent queries used when the input data is a list
+    _MAX_WORKERS: int = 8
+
+    # vendor records loaded from the manuf file, keyed by the assigned block prefix
+    _OUI_TABLE: dict[str, tuple] = {}
+
+    @classmethod
+    def load_local_db(cls, path: Union[str, Path, None] = None, max_age: float = _MANUF_MAX_AGE) -> int:
+        """
+        Loads the Wireshark manuf file into the local OUI table, which is used by
+        lookup_address_information_local.  Without a path, the manuf file in
+        ~/.cache is used, which is downloaded when it is missing or older than
+        max_age seconds.  A manuf file given by path is only downloaded when it
+        is missing, so that a pinned copy is never replaced.
+
+        :param path: location of the manuf file
+        :param max_age: number of seconds before the default manuf file is downloaded again
+        :return: number of block prefixes loaded
+        :rtype: int
+        """
+        if path is None:
+            path = _MANUF_PATH
+            if not path.exists() or time() - path.stat().st_mtime > max_age:
+                cls._download_local_db(path)
+        else:
+            path = Path(path).expanduser()
+            if not path.exists():
+                cls._download_local_db(path)
+        if not path.exists():
+            return 0
+
+        table = {}
+        try:
+            with open(path, encoding='utf-8', errors='replace') as manuf_file:
+                for line in manuf_file:
+                    if line.startswith('#'):
+                        continue
+                    fields = [field.strip() for field in line.split('\t')
+                              if field.strip() and not field.strip().startswith('#')]
+                    if len(fields) < 2:
+                        continue
+                    prefix, _, mask = fields[0].partition('/')
+                    prefix_length = int(mask) // 4 if mask else 6
+                    table[cls._get_hex_digits(prefix)[:prefix_length]] = (fields[-1], None, None)
+        except OSError as error:
+            colorized_text(text=f'The manuf file could not be read: {error}', color='red')
+            return 0
+        cls._OUI_TABLE = table
+        return len(table)
+
+    @staticmethod
+    def _download_local_db(path: Path) -> None:
+        """
+        Downloads the Wireshark manuf file.  The download is written to a temporary
+        file that replaces the manuf file once it is complete.
+
+        :param path: location the manuf file is saved to
+        :return: None
+        """
+        try:
+            response = _SESSION.get(_MANUF_URL, timeout=(5, 60))
+        except requests.RequestException:
+            colorized_text(text="The manuf file could not be downloaded.", color='red')
+            return None
+        if response.status_code != 200:
+            colorized_text(text=f'The manuf file download failed with status code {response.status_code}',
+                           color='red')
+            return None
+        temporary_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f'.{path.name}.', delete=False) as temporary_file:
+                temporary_path = temporary_file.name
+                temporary_file.write(response.content)
+            os.replace(temporary_path, path)
+        except OSError as error:
+            colorized_text(text=f'The manuf file could not be saved: {error}', color='red')
+            if temporary_path is not None and os.path.exists(temporary_path):
+                os.remove(temporary_path)
+        return None
+
+    @classmethod
+    def _lookup_local(cls, hardware_id: str) -> Union[dict, None]:
+        """
+        Obtains the vendor record for the MAC address being queried from the local OUI table.
+
+        :param hardware_id: MAC address being queried
+        :return: dictionary of vendor data or None when the block prefix is not in the table,
+                 or only the MA-L record of a split OUI is
+        :rtype: dict
+        """
+        if not _MAC_RE.match(hardware_id):
+            return None
+        hex_digits = cls._get_hex_digits(hardware_id)
+        for prefix_length in _PREFIX_LENGTHS:
+            record = cls._OUI_TABLE.get(hex_digits[:prefix_length])
+            if record is not None:
+                company, address, country = record
+                if company == _REGISTRATION_AUTHORITY:
+                    # a split OUI whose MA-M or MA-S assignment is not in the table
+                    return None
+                return {'macPrefix': hex_digits[:prefix_length], 'company': company,
+                        'address': address, 'country': country, 'isRand': False}
+        return None
 
     @classmethod
-    def _get_json_data(cls, hardware_id) -> Union[dict, None]:
-        sleep(randint(a=1, b=3))
-        response = requests.get(url=f'https://api.maclookup.app/v2/macs/{hardware_id}', timeout=(5, 10))
+    def close(cls) -> None:
+        """
+        Closes the pooled HTTP session used to query the maclookup database.
+
+        :return: None
+        """
+        global _database
+        _SESSION.close()
+        with _DATABASE_LOCK:
+            if _database is not None:
+                _database.close()
+                _database = None
+
+    @staticmethod
+    def _open_database() -> Union[sqlite3.Connection, None]:
+        """
+        Opens the on-disk vendor database, creating it on first use.
+
+        :return: database connection or None when the database cannot be opened
+        :rtype: sqlite3.Connection
+        """
+        global _database, _database_failed
+        if _database is None and not _database_failed:
+            try:
+                _DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(_DATABASE_PATH, isolation_level=None, check_same_thread=False)
+                connection.execute('PRAGMA journal_mode=WAL')
+                connection.execute('CREATE TABLE IF NOT EXISTS oui(prefix TEXT PRIMARY KEY, company TEXT, '
+                                   'address TEXT, country TEXT, is_rand INT, ts INTEGER, etag TEXT)')
+                # databases created before the etag column was added are upgraded in place
+                columns = {row[1] for row in connection.execute('PRAGMA table_info(oui)')}
+                if 'etag' not in columns:
+                    connection.execute('ALTER TABLE oui ADD COLUMN etag TEXT')
+            except (OSError, sqlite3.Error):
+                colorized_text(text="The MAC vendor database could not be opened.", color='red')
+                _database_failed = True
+                return None
+            _database = connection
+        return _database
+
+    @classmethod
+    def _read_stored_record(cls, prefix: str) -> Union[tuple, None]:
+        """
+        Obtains the vendor record stored on disk for an assigned block prefix.
+
+        :param prefix: hexadecimal digits of the block prefix
+        :return: dictionary of vendor data, its ETag and whether it has expired, or None when missing
+        :rtype: tuple
+        """
+        with _DATABASE_LOCK:
+            database = cls._open_database()
+            if database is None:
+                return None
+            row = database.execute('SELECT company, address, country, is_rand, ts, etag FROM oui WHERE prefix = ?',
+                                   (prefix,)).fetchone()
+        if row is None:
+            return None
+        company, address, country, is_rand, timestamp, etag = row
+        if company == _REGISTRATION_AUTHORITY:
+            # stored before split OUIs were excluded from the cache
+            return None
+        data = {'macPrefix': prefix, 'company': company, 'address': address,
+                'country': country, 'isRand': bool(is_rand)}
+        return data, etag, timestamp < int(time()) - _DATABASE_TTL
+
+    @classmethod
+    def _store_record(cls, prefix: str, data: dict, etag: Union[str, None] = None) -> None:
+        """
+        Stores the vendor record for an assigned block prefix on disk.
+
+        :param prefix: hexadecimal digits of the block prefix
+        :param data: JSON data for the MAC address being queried
+        :param etag: ETag returned with the JSON data
+        :return: None
+        """
+        with _DATABASE_LOCK:
+            database = cls._open_database()
+            if database is None:
+                return
+            database.execute('INSERT OR REPLACE INTO oui(prefix, company, address, country, is_rand, ts, etag) '
+                             'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (prefix, data.get('company'), data.get('address'), data.get('country'),
+                              int(bool(data.get('isRand'))), int(time()), etag))
+
+    @classmethod
+    def _refresh_record(cls, prefix: str) -> None:
+        """
+        Marks the vendor record for an assigned block prefix as current, after the
+        maclookup API has confirmed that it has not changed.
+
+        :param prefix: hexadecimal digits of the block prefix
+        :return: None
+        """
+        with _DATABASE_LOCK:
+            database = cls._open_database()
+            if database is None:
+                return
+            database.execute('UPDATE oui SET ts = ? WHERE prefix = ?', (int(time()), prefix))
+
+    @classmethod
+    def _get_stale_record(cls, hardware_id: str) -> Union[tuple, None]:
+        """
+        Obtains the expired vendor record with an ETag for the MAC address being
+        queried, which can be revalidated with a conditional request.
+
+        :param hardware_id: MAC address being queried
+        :return: block prefix, dictionary of vendor data and ETag, or None when there is no such record
+        :rtype: tuple
+        """
+        hex_digits = cls._get_hex_digits(hardware_id)
+        for prefix_length in _PREFIX_LENGTHS:
+            prefix = hex_digits[:prefix_length]
+            stored_record = cls._read_stored_record(prefix)
+            if stored_record is not None:
+                data, etag, expired = stored_record
+                return (prefix, data, etag) if expired and etag else None
+        return None
+
+    @classmethod
+    def _get_cached_record(cls, hardware_id: str) -> Union[dict, None]:
+        """
+        Obtains the vendor record for the MAC address being queried from the
+        in-memory cache or, failing that, from the on-disk vendor database.
+
+        :param hardware_id: MAC address being queried
+        :return: dictionary of vendor data or None when no record is cached
+        :rtype: dict
+        """
+        hex_digits = cls._get_hex_digits(hardware_id)
+        for prefix_length in _PREFIX_LENGTHS:
+            cached_response = _PREFIX_CACHE.get(hex_digits[:prefix_length])
+            if cached_response is not None:
+                return cached_response
+        for prefix_length in _PREFIX_LENGTHS:
+            prefix = hex_digits[:prefix_length]
+            stored_record = cls._read_stored_record(prefix)
+            if stored_record is not None:
+                stored_response, _, expired = stored_record
+                if expired:
+                    return None
+                _PREFIX_CACHE.set(prefix, stored_response)
+                return stored_response
+        return None
+
+    @staticmethod
+    def _throttle(response) -> None:
+        """
+        Pauses the queries until the rate limit resets when the X-RateLimit headers
+        show that less than 10% of the quota remains.
+
+        :param response: HTTP response returned by the maclookup API
+        :return: None
+        """
+        try:
+            limit = int(response.headers['X-RateLimit-Limit'])
+            remaining = int(response.headers['X-RateLimit-Remaining'])
+            reset = float(response.headers['X-RateLimit-Reset'])
+        except (KeyError, ValueError):
+            return None
+        if remaining < limit * _QUOTA_THRESHOLD:
+            # the reset is either a Unix timestamp or a number of seconds
+            seconds = reset - time() if reset > time() else reset
+            _LIMITER.pause(min(max(seconds, 0.0), _MAX_PAUSE))
+        return None
+
+    @classmethod
+    def _get_json_data(cls, hardware_id: str) -> Union[dict, None]:
+        """
+        Obtains the JSON data for the MAC address being queried.
+
+        :param hardware_id: MAC address being queried
+        :return: dictionary of vendor data
+        :rtype: dict
+        :raises MacLookupUnauthorized: when the maclookup API rejects the request
+        :raises MacLookupRateLimited: when the rate limit is still exceeded after the retries
+        :raises MacLookupError: when the maclookup API reports any other error or cannot be reached
+        """
+        mac_address = cls._normalize_mac(hardware_id)
+        if mac_address is None:
+            colorized_text(text=f'{hardware_id} is not a valid MAC address.', color='red')
+            return None
+
+        cached_response = cls._get_cached_record(mac_address)
+        if cached_response is not None:
+            return cached_response
+
+        # an expired record is revalidated, so an unchanged record is not downloaded again
+        stale_record = cls._get_stale_record(mac_address)
+        headers = {'If-None-Match': stale_record[2]} if stale_record is not None else None
+
+        for attempt in range(_MAX_RETRIES + 1):
+            try:
+                with _LIMITER:
+                    response = _SESSION.get(f'https://api.maclookup.app/v2/macs/{mac_address}',
+                                            headers=headers, timeout=(5, 10))
+            except requests.RequestException as error:
+                raise MacLookupError(f'The query for {mac_address} failed: {error}') from error
+            cls._throttle(response)
+            if response.status_code != 429 or attempt == _MAX_RETRIES:
+                break
+            retry_after = retry_after_seconds(response)
+            if retry_after is None:
+                retry_after = uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** attempt))
+            elif retry_after > _MAX_PAUSE:
+                break
+            _LIMITER.pause(retry_after)
+
         if response.status_code == 400:
-            colorized_text(text="An unknown error has occurred.", color='red')
-            sys.exit(1)
+            raise MacLookupError("An unknown error has occurred.")
         elif response.status_code == 401:
-            colorized_text(text="An Unauthorized Request has occurred.", color='red')
-            sys.exit(1)
+            raise MacLookupUnauthorized("An Unauthorized Request has occurred.")
         elif response.status_code == 429:
-            colorized_text(text="Too Many Requests with the Rate Limit period.", color='red')
-            sys.exit(1)
+            raise MacLookupRateLimited("Too Many Requests with the Rate Limit period.",
+                                       retry_after=retry_after_seconds(response))
+        elif response.status_code == 304 and stale_record is not None:
+            prefix, data, _ = stale_record
+            cls._refresh_record(prefix)
+            _PREFIX_CACHE.set(prefix, data)
+            return data
         elif response.status_code == 200:
-            cls.data = response.json()
-            return cls.data
+            try:
+                data = decode_json(response)
+            except ValueError as error:
+                raise MacLookupError(f'The response for {mac_address} is not valid JSON.') from error
+            mac_prefix = data.get('macPrefix')
+            if mac_prefix and data.get('company') != _REGISTRATION_AUTHORITY:
+                prefix = cls._get_hex_digits(mac_prefix)
+                _PREFIX_CACHE.set(prefix, data)
+                cls._store_record(prefix, data, response.headers.get('ETag'))
+            return data
         return None
 
+    @staticmethod
+    def _get_hex_digits(hardware_id: str) -> str:
+        """
+        Removes the separators from the MAC address being queried.
+
+        :param hardware_id: MAC address being queried
+        :return: uppercase hexadecimal digits of the MAC address
+        :rtype: str
+        """
+        return hardware_id.replace(':', '').replace('-', '').replace('.', '').upper()
+
     @classmethod
-    def _get_registered_organization(cls) -> Union[str, None]:
+    def _normalize_mac(cls, hardware_id: str) -> Union[str, None]:
         """
-        Obtains the name of the registered organization associated with the
-        MAC address being queried.
+        Validates the MAC address being queried and converts it to lowercase
+        colon separated pairs of hexadecimal digits.
 
-        :return: registered organization name
-        :rtype: string
+        :param hardware_id: MAC address being queried
+        :return: normalized MAC address or None when the MAC address is invalid
+        :rtype: str
         """
-        try:
-            if cls.data['isRand'] is True:
-                return "randomly assigned"
-            elif cls.data['isRand'] is False:
-                return cls.data['company']
-        except KeyError:
-            colorized_text(text="Registered organization is not present in JSON data", color='red')
-        return None
+        if not _MAC_RE.match(hardware_id):
+            return None
+        hex_digits = cls._get_hex_digits(hardware_id).lower()
+        return ':'.join(hex_digits[index:index + 2] for index in range(0, 12, 2))
 
     @classmethod
-    def _get_registered_organization_address(cls) -> Union[str, None]:
+    def _get_oui(cls, hardware_id: str) -> str:
         """
-        Obtains the address of the registered organization associated with the
-        MAC address being queried.
+        Obtains the Organizationally Unique Identifier (OUI), which is the first
+        three bytes of the MAC address being queried.
 
-        :return: address of registered organization
-        :rtype: string
+        :param hardware_id: MAC address being queried
+        :return: OUI as six uppercase hexadecimal digits
+        :rtype: str
         """
-        try:
-            if not cls.data['address']:
-                return "address unavailable"
-            elif cls.data['address']:
-                return cls.data['address']
-        except KeyError:
-            colorized_text(text="Registered organization's address is not present in JSON data", color='red')
-        return None
+        return cls._get_hex_digits(hardware_id)[:6]
+
+    @staticmethod
+    def _covers_oui(data: Union[dict, None]) -> bool:
+        """
+        Checks whether the JSON data is for a large (MA-L) block assignment, which
+        covers every MAC address sharing the same OUI.  Medium and small (MA-M and
+        MA-S) assignments only cover part of an OUI, so they cannot be shared.  Nor
+        can the MA-L record of an OUI that the IEEE Registration Authority splits
+        into MA-M and MA-S assignments.
+
+        :param data: JSON data for the MAC address being queried
+        :return: True if the data applies to the whole OUI
+        :rtype: bool
+        """
+        return (bool(data) and len(data.get('macPrefix') or '') == 6
+                and data.get('company') != _REGISTRATION_AUTHORITY)
+
+    @staticmethod
+    def _build_data_elements(hardware_id: str, data: Union[dict, None]) -> dict:
+        """
+        Extracts the data elements related to the MAC address being queried.
+
+        :param hardware_id: MAC address being queried
+        :param data: JSON data for the MAC address being queried
+        :return: dict of data elements related to the MAC address
+        :rtype: dict
+        """
+        if not data:
+            return {'mac_address': hardware_id,
+                    'registered_organization': None,
+                    'organization_address': None,
+                    'country': None}
+        return {'mac_address': hardware_id,
+                'registered_organization': "randomly assigned" if data.get('isRand') else data.get('company'),
+                'organization_address': data.get('address') or "address unavailable",
+                'country': data.get('country') or "country unavailable"}
+
+    @classmethod
+    def _group_by_oui(cls, hardware_ids: list[str]) -> dict:
+        """
+        Selects the first MAC address of every distinct OUI, which is queried
+        on behalf of the other MAC addresses with the same OUI.
+
+        :param hardware_ids: MAC addresses being queried
+        :return: dict of representative MAC addresses keyed by OUI
+        :rtype: dict
+        """
+        representatives = {}
+        for hardware_id in hardware_ids:
+            representatives.setdefault(cls._get_oui(hardware_id), hardware_id)
+        return representatives
+
+    @classmethod
+    def _split_shared_records(cls, hardware_ids: list[str], representatives: dict, records: dict) -> tuple:
+        """
+        Separates the responses that are shared by every MAC address with the same OUI
+        from the MAC addresses that still have to be queried individually.
+
+        :param hardware_ids: MAC addresses being queried
+        :param representatives: dict of representative MAC addresses keyed by OUI
+        :param records: JSON data keyed by the MAC addresses queried so far
+        :return: dict of shared JSON data keyed by OUI and list of remaining MAC addresses
+        :rtype: tuple
+        """
+        shared_records = {oui: records[hardware_id] for oui, hardware_id in representatives.items()
+                          if cls._covers_oui(records[hardware_id])}
+        remaining = [hardware_id for hardware_id in dict.fromkeys(hardware_ids)
+                     if hardware_id not in records and cls._get_oui(hardware_id) not in shared_records]
+        return shared_records, remaining
+
+    @classmethod
+    def _build_results(cls, hardware_ids: list[str], records: dict, shared_records: dict) -> list[dict]:
+        """
+        Extracts the data elements for every MAC address being queried.
+
+        :param hardware_ids: MAC addresses being queried
+        :param records: JSON data keyed by MAC address
+        :param shared_records: JSON data keyed by OUI
+        :return: dicts of data elements in the same order as the MAC addresses
+        :rtype: list
+        """
+        return [cls._build_data_elements(hardware_id,
+                                         records.get(hardware_id, shared_records.get(cls._get_oui(hardware_id))))
+                for hardware_id in hardware_ids]
 
     @classmethod
-    def _get_registered_organization_country(cls) -> Union[str, None]:
+    def _get_json_data_or_none(cls, hardware_id: str) -> Union[dict, None]:
         """
-        Obtains the country code for the registered organization associated
-        with the MAC address being queried.
+        Version of _get_json_data used for lists of MAC addresses, which reports a
+        MAC address whose query failed instead of raising, so that the results of
+        the other MAC addresses are kept.  An unauthorized request is still raised,
+        because it applies to every MAC address in the list.
 
-        :return: country code of registered organization
-        :rtype: string
+        :param hardware_id: MAC address being queried
+        :return: dictionary of vendor data or None when the query failed
+        :rtype: dict
+        :raises MacLookupUnauthorized: when the maclookup API rejects the request
         """
         try:
-            if not cls.data['country']:
-                return "country unavailable"
-            elif cls.data['country']:
-                return cls.data['country']
-        except KeyError:
-            colorized_text(text="Registered organization's country is not present in JSON data", color='red')
-        return None
+            return cls._get_json_data(hardware_id)
+        except MacLookupUnauthorized:
+            raise
+        except MacLookupError as error:
+            colorized_text(text=f'Skipping {hardware_id}: {error}', color='red')
+            return None
+
+    @classmethod
+    def _batch_fetch(cls, hardware_ids: list[str], skip_failed: bool = False) -> list[dict]:
+        """
+        Queries the maclookup database for a list of MAC addresses, sending one
+        request per distinct OUI.  The response is shared by the other MAC addresses
+        with the same OUI when it is for a large (MA-L) block assignment; the
+        remaining MAC addresses are then queried individually.
+
+        :param hardware_ids: MAC addresses being queried
+        :param skip_failed: report MAC addresses whose query failed as unavailable instead of raising
+        :return: dicts of data elements in the same order as the MAC addresses
+        :rtype: list
+        """
+        fetch = cls._get_json_data_or_none if skip_failed else cls._get_json_data
+        representatives = cls._group_by_oui(hardware_ids)
+        responses = map_in_threads(fetch, representatives.values(), cls._MAX_WORKERS)
+        records = dict(zip(representatives.values(), responses))
+        shared_records, remaining = cls._split_shared_records(hardware_ids, representatives, records)
+        records.update(zip(remaining, map_in_threads(fetch, remaining, cls._MAX_WORKERS)))
+        return cls._build_results(hardware_ids, records, shared_records)
+
+    @classmethod
+    async def _batch_fetch_async(cls, hardware_ids: list[str], skip_failed: bool = False) -> list[dict]:
+        """
+        Asynchronous version of _batch_fetch, which awaits the queries against
+        the maclookup database.
+
+        :param hardware_ids: MAC addresses being queried
+        :param skip_failed: report MAC addresses whose query failed as unavailable instead of raising
+        :return: dicts of data elements in the same order as the MAC addresses
+        :rtype: list
+        """
+        fetch = cls._get_json_data_or_none if skip_failed else cls._get_json_data
+        representatives = cls._group_by_oui(hardware_ids)
+        responses = await gather_in_threads(fetch, representatives.values(), cls._MAX_WORKERS)
+        records = dict(zip(representatives.values(), responses))
+        shared_records, remaining = cls._split_shared_records(hardware_ids, representatives, records)
+        records.update(zip(remaining, await gather_in_threads(fetch, remaining, cls._MAX_WORKERS)))
+        return cls._build_results(hardware_ids, records, shared_records)
 
     def lookup_address_information(self) -> Union[dict | list[dict] | None]:
         """
@@ -151,29 +667,41 @@ class MacAddressLookup:
         MAC address being queried.
 
         :return: registered agent information
-        :rtype: tuple
+        :rtype: dict or list
         """
-        if isinstance(self.lookup_value, str):
-            MacAddressLookup._get_json_data(self.lookup_value)
-            registered_organization = MacAddressLookup._get_registered_organization()
-            organization_address = MacAddressLookup._get_registered_organization_address()
-            country = MacAddressLookup._get_registered_organization_country()
-            data_elements = {'mac_address': self.lookup_value,
-                             'registered_organization': registered_organization,
-                             'organization_address': organization_address,
-                             'country': country}
-            return data_elements
-        elif isinstance(self.lookup_value, list):
-            data_elements = []
-            for item in self.lookup_value:
-                MacAddressLookup._get_json_data(item)
-                registered_organization = MacAddressLookup._get_registered_organization()
-                organization_address = MacAddressLookup._get_registered_organization_address()
-                country = MacAddressLookup._get_registered_organization_country()
-                data = {'mac_address': item,
-                        'registered_organization': registered_organization,
-                        'organization_address': organization_address,
-                        'country': country}
-                data_elements.append(data)
-            return data_elements
-        return None
+        hardware_ids = [self.lookup_value] if isinstance(self.lookup_value, str) else list(self.lookup_value)
+        results = MacAddressLookup._batch_fetch(hardware_ids, skip_failed=not isinstance(self.lookup_value, str))
+        return results[0] if isinstance(self.lookup_value, str) else results
+
+    def lookup_address_information_local(self) -> Union[dict | list[dict] | None]:
+        """
+        Searches the local OUI table loaded by load_local_db for the MAC address
+        being queried.  Only the MAC addresses that are not in the table are
+        queried against the maclookup database.
+
+        :return: registered agent information
+        :rtype: dict or list
+        """
+        hardware_ids = [self.lookup_value] if isinstance(self.lookup_value, str) else list(self.lookup_value)
+        records = {hardware_id: MacAddressLookup._lookup_local(hardware_id) for hardware_id in hardware_ids}
+        missing = [hardware_id for hardware_id, data in records.items() if data is None]
+        responses = MacAddressLookup._batch_fetch(missing, skip_failed=not isinstance(self.lookup_value, str))
+        fetched = dict(zip(missing, responses))
+        results = [fetched[hardware_id] if records[hardware_id] is None
+                   else MacAddressLookup._build_data_elements(hardware_id, records[hardware_id])
+                   for hardware_id in hardware_ids]
+        return results[0] if isinstance(self.lookup_value, str) else results
+
+    async def lookup_address_information_async(self) -> Union[dict | list[dict] | None]:
+        """
+        Asynchronous version of lookup_address_information, which allows the
+        queries against the maclookup database to be awaited alongside other
+        coroutines.  List inputs are queried concurrently.
+
+        :return: registered agent information
+        :rtype: dict or list
+        """
+        hardware_ids = [self.lookup_value] if isinstance(self.lookup_value, str) else list(self.lookup_value)
+        results = await MacAddressLookup._batch_fetch_async(hardware_ids,
+                                                            skip_failed=not isinstance(self.lookup_value, str))
+        return results[0] if isinstance(self.lookup_value, str) else results
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+"""
+This Python script provides helpers for running the blocking lookup functions
+concurrently in worker threads, either directly or from asyncio coroutines.
+"""
+__author__ = 'John Bumgarner'
+__date__ = 'October 15, 2026'
+__status__ = 'Production'
+__license__ = 'GPL-3'
+__copyright__ = "Copyright (C) 2026 John Bumgarner"
+
+
+##################################################################################
+# “AS-IS” Clause
+#
+# Except as represented in this agreement, all work produced by Developer is
+# provided “AS IS”. Other than as provided in this agreement, Developer makes no
+# other warranties, express or implied, and hereby disclaims all implied warranties,
+# including any warranty of merchantability and warranty of fitness for a particular
+# purpose.
+##################################################################################
+
+##################################################################################
+# Date Completed: October 15, 2026
+# Author: John Bumgarner
+#
+# Date Last Revised:
+# Revised by:
+##################################################################################
+
+##################################################################################
+# Python imports required for basic operations
+##################################################################################
+# Standard library imports
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Union
+
+
+async def gather_in_threads(function: Callable,
+                            items: Iterable,
+                            max_concurrency: int,
+                            *args: Any) -> list:
+    """
+    This function runs a blocking function for each item in worker threads and
+    awaits all the results, with at most max_concurrency calls in flight.
+
+    :param function: blocking function called as function(item, *args)
+    :param items: input values passed to the function one at a time
+    :param max_concurrency: maximum number of calls running at the same time
+    :param args: additional arguments passed to each call
+    :return: results in the same order as the items
+    :rtype: list
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(item: Any) -> Any:
+        async with semaphore:
+            return await asyncio.to_thread(function, item, *args)
+
+    return list(await asyncio.gather(*(run_one(item) for item in items)))
+
+
+def map_in_threads(function: Callable,
+                   items: Iterable,
+                   max_workers: int,
+                   *args: Any) -> list:
+    """
+    This function is the synchronous counterpart of gather_in_threads, which runs
+    a blocking function for each item in a pool of worker threads.
+
+    :param function: blocking function called as function(item, *args)
+    :param items: input values passed to the function one at a time
+    :param max_workers: maximum number of calls running at the same time
+    :param args: additional arguments passed to each call
+    :return: results in the same order as the items
+    :rtype: list
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda item: function(item, *args), items))
+
+
+def _split_lookup_value(lookup_value: Union[str, Iterable[str]]) -> tuple:
+    """
+    This function normalizes the input data of a lookup class, which is either
+    a single value or a list of values, to a list and its unique values.
+
+    :param lookup_value: single value or list of values being queried
+    :return: list of the values and list of the unique values in order
+    :rtype: tuple
+    """
+    values = [lookup_value] if isinstance(lookup_value, str) else list(lookup_value)
+    return values, list(dict.fromkeys(values))
+
+
+def _join_results(lookup_value: Union[str, Iterable[str]],
+                  values: list,
+                  unique_values: list,
+                  responses: list) -> Union[Any, list]:
+    """
+    This function expands the results of the unique values back to the input data,
+    returning a single result for a single value and the non-empty results otherwise.
+
+    :param lookup_value: single value or list of values being queried
+    :param values: list of the values
+    :param unique_values: list of the unique values in order
+    :param responses: results in the same order as the unique values
+    :return: result of the single value or list of results
+    :rtype: Any or list
+    """
+    results = dict(zip(unique_values, responses))
+    if isinstance(lookup_value, str):
+        return results[lookup_value]
+    return [results[value] for value in values if results[value] is not None]
+
+
+def query_each(function: Callable,
+               lookup_value: Union[str, Iterable[str]],
+               max_workers: int,
+               *args: Any) -> Union[Any, list]:
+    """
+    This function queries a single value or a list of values concurrently, calling
+    the blocking function once for each unique value.
+
+    :param function: blocking function called as function(value, *args)
+    :param lookup_value: single value or list of values being queried
+    :param max_workers: maximum number of calls running at the same time
+    :param args: additional arguments passed to each call
+    :return: result of the single value or list of non-empty results in the input order
+    :rtype: Any or list
+    """
+    values, unique_values = _split_lookup_value(lookup_value)
+    responses = map_in_threads(function, unique_values, max_workers, *args)
+    return _join_results(lookup_value, values, unique_values, responses)
+
+
+async def query_each_async(function: Callable,
+                           lookup_value: Union[str, Iterable[str]],
+                           max_concurrency: int,
+                           *args: Any) -> Union[Any, list]:
+    """
+    This function is the asynchronous version of query_each, which awaits the
+    calls of the blocking function in worker threads.
+
+    :param function: blocking function called as function(value, *args)
+    :param lookup_value: single value or list of values being queried
+    :param max_concurrency: maximum number of calls running at the same time
+    :param args: additional arguments passed to each call
+    :return: result of the single value or list of non-empty results in the input order
+    :rtype: Any or list
+    """
+    values, unique_values = _split_lookup_value(lookup_value)
+    responses = await gather_in_threads(function, unique_values, max_concurrency, *args)
+    return _join_results(lookup_value, values, unique_values, responses)
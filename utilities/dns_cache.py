@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+This Python script provides a context manager that caches the DNS resolution of
+the fixed API hostnames, so that new connections to them skip the DNS lookup.
+"""
+__author__ = 'John Bumgarner'
+__date__ = 'October 15, 2026'
+__status__ = 'Production'
+__license__ = 'GPL-3'
+__copyright__ = "Copyright (C) 2026 John Bumgarner"
+
+
+##################################################################################
+# “AS-IS” Clause
+#
+# Except as represented in this agreement, all work produced by Developer is
+# provided “AS IS”. Other than as provided in this agreement, Developer makes no
+# other warranties, express or implied, and hereby disclaims all implied warranties,
+# including any warranty of merchantability and warranty of fitness for a particular
+# purpose.
+##################################################################################
+
+##################################################################################
+# Date Completed: October 15, 2026
+# Author: John Bumgarner
+#
+# Date Last Revised:
+# Revised by:
+##################################################################################
+
+##################################################################################
+# Python imports required for basic operations
+##################################################################################
+# Standard library imports
+import socket
+import functools
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+
+@contextmanager
+def cached_dns(hostnames: Iterable[str]) -> Iterator[None]:
+    """
+    This function caches the results of socket.getaddrinfo for the given hostnames
+    while the context is active. Other hostnames are resolved as usual, and the
+    original resolver is restored when the context exits.
+
+    :param hostnames: hostnames whose DNS resolution is cached
+    :return: None
+    """
+    original_getaddrinfo = socket.getaddrinfo
+    cached_hostnames = frozenset(hostnames)
+
+    @functools.lru_cache(maxsize=32)
+    def cached_getaddrinfo(host, *args, **kwargs):
+        return original_getaddrinfo(host, *args, **kwargs)
+
+    def getaddrinfo(host, *args, **kwargs):
+        if host in cached_hostnames:
+            return cached_getaddrinfo(host, *args, **kwargs)
+        return original_getaddrinfo(host, *args, **kwargs)
+
+    socket.getaddrinfo = getaddrinfo
+    try:
+        yield
+    finally:
+        socket.getaddrinfo = original_getaddrinfo
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+"""
+This Python script provides a pooled HTTP session that is shared by the
+lookup modules, so that connections to the remote APIs are kept alive and
+reused across multiple queries.
+"""
+__author__ = 'John Bumgarner'
+__date__ = 'October 15, 2026'
+__status__ = 'Production'
+__license__ = 'GPL-3'
+__copyright__ = "Copyright (C) 2026 John Bumgarner"
+
+
+##################################################################################
+# “AS-IS” Clause
+#
+# Except as represented in this agreement, all work produced by Developer is
+# provided “AS IS”. Other than as provided in this agreement, Developer makes no
+# other warranties, express or implied, and hereby disclaims all implied warranties,
+# including any warranty of merchantability and warranty of fitness for a particular
+# purpose.
+##################################################################################
+
+##################################################################################
+# Date Completed: October 15, 2026
+# Author: John Bumgarner
+#
+# Date Last Revised:
+# Revised by:
+##################################################################################
+
+##################################################################################
+# Python imports required for basic operations
+##################################################################################
+# Standard library imports
+from typing import Union
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+# Third-party imports
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    # orjson is optional and decodes the response bytes faster than the standard library
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def create_session(pool_connections: int = 10,
+                   pool_maxsize: int = 20,
+                   retries: int = 3,
+                   backoff_factor: float = 0.3,
+                   status_forcelist: tuple = (500, 502, 503, 504),
+                   respect_retry_after: bool = False) -> requests.Session:
+    """
+    This function creates a requests Session with a connection pool and a retry
+    policy mounted for both HTTP and HTTPS.
+
+    :param pool_connections: number of connection pools to cache
+    :param pool_maxsize: maximum number of connections to keep in each pool
+    :param retries: total number of retries for failed requests
+    :param backoff_factor: backoff factor applied between retry attempts
+    :param status_forcelist: HTTP status codes that trigger a retry; 429 is left to the
+                             lookup modules, which pause their rate limiter for it
+    :param respect_retry_after: sleep for the duration of the Retry-After header between retries
+    :return: pooled HTTP session
+    :rtype: requests.Session
+    """
+    retry_policy = Retry(total=retries,
+                         backoff_factor=backoff_factor,
+                         status_forcelist=status_forcelist,
+                         allowed_methods=frozenset(['GET']),
+                         respect_retry_after_header=respect_retry_after,
+                         raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          max_retries=retry_policy)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def retry_after_seconds(response: requests.Response) -> Union[float, None]:
+    """
+    This function obtains the number of seconds the server asked the client to
+    wait from the Retry-After header, which may be either seconds or an HTTP date.
+
+    :param response: HTTP response returned by the server
+    :return: number of seconds to wait or None when the header is missing or invalid
+    :rtype: float
+    """
+    retry_after = response.headers.get('Retry-After')
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_date = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+
+
+def decode_json(response: requests.Response) -> Union[dict, list]:
+    """
+    This function decodes the JSON body of a response, using orjson on the raw
+    bytes when it is installed and falling back to response.json() otherwise.
+
+    :param response: HTTP response returned by the server
+    :return: decoded JSON data
+    :rtype: dict or list
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            # let requests raise its own exception type for invalid JSON
+            pass
+    return response.json()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""
+This Python script provides a thread-safe rate limiter that is used to keep
+the queries sent to the remote APIs within the limits published by each service.
+"""
+__author__ = 'John Bumgarner'
+__date__ = 'October 15, 2026'
+__status__ = 'Production'
+__license__ = 'GPL-3'
+__copyright__ = "Copyright (C) 2026 John Bumgarner"
+
+
+##################################################################################
+# “AS-IS” Clause
+#
+# Except as represented in this agreement, all work produced by Developer is
+# provided “AS IS”. Other than as provided in this agreement, Developer makes no
+# other warranties, express or implied, and hereby disclaims all implied warranties,
+# including any warranty of merchantability and warranty of fitness for a particular
+# purpose.
+##################################################################################
+
+##################################################################################
+# Date Completed: October 15, 2026
+# Author: John Bumgarner
+#
+# Date Last Revised:
+# Revised by:
+##################################################################################
+
+##################################################################################
+# Python imports required for basic operations
+##################################################################################
+# Standard library imports
+import threading
+from collections import deque
+from time import monotonic, sleep
+
+
+class RateLimiter:
+    """
+    Purpose
+    ----------
+
+    This Python class limits the number of calls made within a sliding time window.
+    A call only waits when the limit for the current window has been reached.
+
+    Usage Examples
+    ----------
+
+    limiter = RateLimiter(max_calls=45, period=60)
+    with limiter:
+        # make the request
+
+    Parameters
+    ----------
+    :param max_calls: maximum number of calls allowed within the period
+    :param period: length of the time window in seconds
+    """
+
+    def __init__(self,
+                 max_calls: int,
+                 period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Blocks until a call is permitted within the current time window.
+
+        :return: None
+        """
+        with self._lock:
+            while True:
+                now = monotonic()
+                if now < self._paused_until:
+                    sleep(self._paused_until - now)
+                    continue
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                sleep(self.period - (now - self._calls[0]))
+
+    def pause(self, seconds: float) -> None:
+        """
+        Holds back all calls for the given number of seconds, such as when the
+        remote API has returned a Retry-After header.
+
+        :param seconds: number of seconds to wait before the next call
+        :return: None
+        """
+        self._paused_until = max(self._paused_until, monotonic() + seconds)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        return False
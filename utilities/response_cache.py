@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+"""
+This Python script provides a thread-safe in-memory cache for the decoded
+responses returned by the remote APIs, so that repeated queries for the same
+value are not sent over the network again.
+"""
+__author__ = 'John Bumgarner'
+__date__ = 'October 15, 2026'
+__status__ = 'Production'
+__license__ = 'GPL-3'
+__copyright__ = "Copyright (C) 2026 John Bumgarner"
+
+
+##################################################################################
+# “AS-IS” Clause
+#
+# Except as represented in this agreement, all work produced by Developer is
+# provided “AS IS”. Other than as provided in this agreement, Developer makes no
+# other warranties, express or implied, and hereby disclaims all implied warranties,
+# including any warranty of merchantability and warranty of fitness for a particular
+# purpose.
+##################################################################################
+
+##################################################################################
+# Date Completed: October 15, 2026
+# Author: John Bumgarner
+#
+# Date Last Revised:
+# Revised by:
+##################################################################################
+
+##################################################################################
+# Python imports required for basic operations
+##################################################################################
+# Standard library imports
+import threading
+from time import monotonic
+from collections import OrderedDict
+from typing import Any, Hashable, Union
+
+
+class ResponseCache:
+    """
+    Purpose
+    ----------
+
+    This Python class stores decoded API responses for a limited amount of time.
+    The least recently used entry is discarded once the cache is full.
+
+    Usage Examples
+    ----------
+
+    cache = ResponseCache(maxsize=4096, ttl=3600)
+    data = cache.get('67.21.32.233')
+    if data is None:
+        data = # query the API
+        cache.set('67.21.32.233', data)
+
+    Parameters
+    ----------
+    :param maxsize: maximum number of responses held in the cache
+    :param ttl: number of seconds a response remains valid
+    """
+
+    def __init__(self,
+                 maxsize: int = 4096,
+                 ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Union[Any, None]:
+        """
+        Obtains the cached response for a key.
+
+        :param key: value that was queried
+        :return: cached response or None when missing or expired
+        :rtype: Any
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores the response for a key.
+
+        :param key: value that was queried
+        :param value: decoded response
+        :return: None
+        """
+        with self._lock:
+            self._entries[key] = (monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Removes all the cached responses.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()